@@ -15,3 +15,14 @@ EMBED_MODEL = os.getenv("EMBED_MODEL", "nomic-embed-text:latest")
 NVIDIA_API_KEY = os.getenv("NVIDIA_API_KEY")
 BASE_URL = os.getenv("BASE_URL")
 MODEL_NAME = os.getenv("MODEL_NAME")
+
+# ==============================
+# PROVIDER POOL (HEDGING / FAILOVER)
+# ==============================
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "120"))
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "5"))
+HEDGE_DEFAULT_DELAY = float(os.getenv("HEDGE_DEFAULT_DELAY", "10"))
+LATENCY_WINDOW = int(os.getenv("LATENCY_WINDOW", "100"))
+MAX_TRACKED_PROVIDERS = int(os.getenv("MAX_TRACKED_PROVIDERS", "32"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
@@ -3,7 +3,8 @@ import numpy as np
 from statistics import mean
 
 from openai import OpenAI
-from config import OLLAMA_BASE_URL, EMBED_MODEL, NVIDIA_API_KEY, BASE_URL, MODEL_NAME
+from config import OLLAMA_BASE_URL, EMBED_MODEL
+from provider_service import chat_completion
 import nltk
 from nltk.corpus import stopwords
 from nltk.stem import PorterStemmer
@@ -24,40 +25,6 @@ except LookupError:
 stemmer = PorterStemmer()
 stop_words = set(stopwords.words('english'))
 
-def get_client(config=None):
-    api_key = NVIDIA_API_KEY
-    base_url = BASE_URL
-    
-    if config:
-        if config.get("api_key"):
-            api_key = config["api_key"]
-        
-        # Priority: explicit base_url > provider mapping
-        if config.get("base_url"):
-            base_url = config["base_url"]
-        elif config.get("llm_type"):
-            llm_type = config.get("llm_type").lower()
-            if llm_type == "nvidia":
-                base_url = "https://integrate.api.nvidia.com/v1"
-            elif llm_type == "openai" or llm_type == "gpt":
-                base_url = "https://api.openai.com/v1"
-            elif llm_type == "gemini":
-                base_url = "https://generativelanguage.googleapis.com/v1beta/openai/"
-            elif llm_type == "ollama" or llm_type == "local":
-                 base_url = config.get("ollama_url") or OLLAMA_BASE_URL
-                 if not base_url.endswith("/v1"):
-                     base_url = base_url.rstrip("/") + "/v1"
-
-    return OpenAI(
-        api_key=api_key or "dummy", 
-        base_url=base_url
-    )
-
-def get_model_name(config=None):
-    if config and config.get("model_name"):
-        return config["model_name"]
-    return MODEL_NAME
-
 # ==============================
 # EMBEDDING
 # ==============================
@@ -147,12 +114,9 @@ Return short structured description only.
 User message:
 {user_message}
 """
-    client = get_client(config)
-    model = get_model_name(config)
-    
-    response = client.chat.completions.create(
-        model=model,
+    response = chat_completion(
         messages=[{"role": "user", "content": prompt}],
+        config=config,
         temperature=0.1
     )
     return response.choices[0].message.content.strip()
@@ -263,12 +227,9 @@ Classify:
 
 Return JSON only.
 """
-    client = get_client(config)
-    model = get_model_name(config)
-
-    response = client.chat.completions.create(
-        model=model,
+    response = chat_completion(
         messages=[{"role": "user", "content": prompt}],
+        config=config,
         temperature=0.1
     )
 
@@ -287,12 +248,9 @@ Conversation:
 Return JSON with keys: "deviated_into", "user_expectation".
 """
 
-    client = get_client(config)
-    model = get_model_name(config)
-
-    response = client.chat.completions.create(
-        model=model,
+    response = chat_completion(
         messages=[{"role": "user", "content": prompt}],
+        config=config,
         temperature=0.1,
         response_format={"type": "json_object"}
     )
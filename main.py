@@ -9,6 +9,7 @@ from models import ChatRequest
 from deviation_service import analyze_conversation, evaluate_deviations
 from summary_service import build_conversation_text, summarize_transcript
 from reconstruction_service import generate_expert_prompt
+from provider_service import get_provider_stats
 import config as app_config
 
 
@@ -58,6 +59,14 @@ def get_config():
         "ollama_url": app_config.OLLAMA_BASE_URL
     }
 
+# =====================================================
+# Provider Latency Stats (for hedging/failover tuning)
+# =====================================================
+
+@app.get("/providers/stats")
+def provider_stats():
+    return get_provider_stats()
+
 # =====================================================
 # Streaming Analyze Endpoint
 # =====================================================
@@ -80,7 +89,11 @@ async def analyze_stream(chat: ChatRequest):
         "llm_type": chat.llm_type,
         "api_key": chat.api_key,
         "base_url": chat.base_url,
-        "model_name": chat.model_name
+        "model_name": chat.model_name,
+        "fallback_providers": [p.model_dump() for p in chat.fallback_providers or []],
+        "hedge_requests": chat.hedge_requests,
+        "hedge_percentile": chat.hedge_percentile,
+        "request_timeout": chat.request_timeout
     }
 
     try:
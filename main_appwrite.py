@@ -1,4 +1,6 @@
 import json
+from pydantic import ValidationError
+from models import ProviderPoolOptions
 from deviation_service import analyze_conversation, evaluate_deviations
 from summary_service import build_conversation_text, summarize_transcript
 from reconstruction_service import generate_expert_prompt
@@ -21,6 +23,11 @@ def main(context):
         if not body.get("conversation"):
             return context.res.json({"error": "Missing 'conversation' in request body"}, status_code=400)
 
+        try:
+            pool_options = ProviderPoolOptions.model_validate(body)
+        except ValidationError as e:
+            return context.res.json({"error": f"Invalid provider pool options: {e}"}, status_code=400)
+
         # ── Extract runtime config ──────────────────────────────────────
         runtime_config = {
             "embedding_model":    body.get("embedding_model"),
@@ -31,6 +38,10 @@ def main(context):
             "base_url":           body.get("base_url"),
             "model_name":         body.get("model_name"),
             "ollama_url":         body.get("ollama_url"),
+            "fallback_providers": [p.model_dump() for p in pool_options.fallback_providers or []],
+            "hedge_requests":     pool_options.hedge_requests,
+            "hedge_percentile":   pool_options.hedge_percentile,
+            "request_timeout":    pool_options.request_timeout,
         }
 
         context.log("Step 1/4: Preprocessing & Embedding...")
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 
 
@@ -7,7 +7,25 @@ class Message(BaseModel):
     content: str
 
 
-class ChatRequest(BaseModel):
+class ProviderConfig(BaseModel):
+    llm_type: Optional[str] = None
+    api_key: Optional[str] = None
+    base_url: Optional[str] = None
+    model_name: Optional[str] = None
+    ollama_url: Optional[str] = None
+
+    model_config = {"protected_namespaces": ()}
+
+
+class ProviderPoolOptions(BaseModel):
+    # Provider pool: fallbacks are tried on error/timeout, or raced when hedging
+    fallback_providers: Optional[List[ProviderConfig]] = None
+    hedge_requests: Optional[bool] = False
+    hedge_percentile: Optional[float] = Field(default=None, gt=0, le=100)
+    request_timeout: Optional[float] = Field(default=None, gt=0)
+
+
+class ChatRequest(ProviderPoolOptions):
     conversation: List[Message]
     # Dynamic Configuration
     embedding_model: Optional[str] = "nomic-embed-text:latest"
@@ -0,0 +1,311 @@
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from openai import AsyncOpenAI
+from config import (
+    OLLAMA_BASE_URL,
+    NVIDIA_API_KEY,
+    BASE_URL,
+    MODEL_NAME,
+    LLM_REQUEST_TIMEOUT,
+    LLM_MAX_RETRIES,
+    HEDGE_PERCENTILE,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_DEFAULT_DELAY,
+    LATENCY_WINDOW,
+    MAX_TRACKED_PROVIDERS,
+)
+
+# ==============================
+# CLIENT RESOLUTION
+# ==============================
+
+NVIDIA_URL = "https://integrate.api.nvidia.com/v1"
+
+def resolve_endpoint(config=None):
+    api_key = None
+    base_url = BASE_URL
+    
+    if config:
+        if config.get("api_key"):
+            api_key = config["api_key"]
+        
+        # Priority: explicit base_url > provider mapping
+        if config.get("base_url"):
+            base_url = config["base_url"]
+        elif config.get("llm_type"):
+            llm_type = config.get("llm_type").lower()
+            if llm_type == "nvidia":
+                base_url = NVIDIA_URL
+            elif llm_type == "openai" or llm_type == "gpt":
+                base_url = "https://api.openai.com/v1"
+            elif llm_type == "gemini":
+                base_url = "https://generativelanguage.googleapis.com/v1beta/openai/"
+            elif llm_type == "ollama" or llm_type == "local":
+                 base_url = config.get("ollama_url") or OLLAMA_BASE_URL
+                 if not base_url.endswith("/v1"):
+                     base_url = base_url.rstrip("/") + "/v1"
+
+    # The server's key only goes to the server's own endpoint or to NVIDIA
+    if not api_key and base_url in (BASE_URL, NVIDIA_URL):
+        api_key = NVIDIA_API_KEY
+
+    return api_key or "dummy", base_url
+
+def get_model_name(config=None):
+    if config and config.get("model_name"):
+        return config["model_name"]
+    return MODEL_NAME
+
+
+# ==============================
+# LATENCY STATS
+# ==============================
+
+_stats_lock = threading.Lock()
+# Least recently used first; capped because keys come from client requests
+_provider_stats = OrderedDict()
+
+
+def provider_key(config=None):
+    # Base URLs are hashed so /providers/stats never reveals callers' hosts
+    _, base_url = resolve_endpoint(config)
+    llm_type = (config or {}).get("llm_type") or "default"
+    url_hash = hashlib.sha256(str(base_url).encode()).hexdigest()[:8]
+    return f"{llm_type}:{get_model_name(config)}#{url_hash}"
+
+
+def _get_stats(key):
+    stats = _provider_stats.get(key)
+    if stats is None:
+        stats = {
+            "latencies": deque(maxlen=LATENCY_WINDOW),
+            "successes": 0,
+            "errors": 0,
+            "timeouts": 0,
+            "cancelled": 0,
+            "hedges_fired": 0,
+            "hedges_won": 0,
+        }
+        _provider_stats[key] = stats
+        if len(_provider_stats) > MAX_TRACKED_PROVIDERS:
+            _provider_stats.popitem(last=False)
+    else:
+        _provider_stats.move_to_end(key)
+    return stats
+
+
+def record_event(key, event, latency=None):
+    with _stats_lock:
+        stats = _get_stats(key)
+        stats[event] += 1
+        if latency is not None:
+            stats["latencies"].append(latency)
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def hedge_delay(key, percentile=None):
+    """Seconds to wait on a provider before firing a backup request."""
+    with _stats_lock:
+        stats = _provider_stats.get(key)
+        latencies = list(stats["latencies"]) if stats else []
+
+    if len(latencies) < HEDGE_MIN_SAMPLES:
+        return HEDGE_DEFAULT_DELAY
+    return _percentile(latencies, percentile or HEDGE_PERCENTILE)
+
+
+def get_provider_stats():
+    with _stats_lock:
+        snapshot = {key: dict(stats, latencies=list(stats["latencies"]))
+                    for key, stats in _provider_stats.items()}
+
+    report = {}
+    for key, stats in snapshot.items():
+        latencies = stats.pop("latencies")
+        stats["samples"] = len(latencies)
+        if latencies:
+            stats["p50_seconds"] = _percentile(latencies, 50)
+            stats["p95_seconds"] = _percentile(latencies, 95)
+            stats["p99_seconds"] = _percentile(latencies, 99)
+        stats["hedge_delay_seconds"] = (
+            HEDGE_DEFAULT_DELAY if len(latencies) < HEDGE_MIN_SAMPLES
+            else _percentile(latencies, HEDGE_PERCENTILE)
+        )
+        report[key] = stats
+    return report
+
+
+# ==============================
+# PROVIDER POOL
+# ==============================
+
+def build_provider_pool(config=None):
+    # Primary first, then fallbacks in the order given. Fallbacks never
+    # inherit the primary's api_key; see resolve_endpoint for the env key.
+    pool = [config or {}]
+    if config and config.get("fallback_providers"):
+        pool.extend(p for p in config["fallback_providers"] if p)
+    return pool
+
+
+async def _call_provider(provider, messages, params, timeout):
+    key = provider_key(provider)
+    api_key, base_url = resolve_endpoint(provider)
+    start = time.perf_counter()
+
+    try:
+        # The timeout bounds the whole attempt, SDK retries included
+        async with AsyncOpenAI(
+            api_key=api_key, base_url=base_url, max_retries=LLM_MAX_RETRIES
+        ) as client:
+            response = await asyncio.wait_for(
+                client.chat.completions.create(
+                    model=get_model_name(provider),
+                    messages=messages,
+                    **params
+                ),
+                timeout=timeout
+            )
+    # Cancellation is recorded by the race, which knows if the attempt was
+    # slow. A timed-out call is the slow tail: keep its elapsed time as a
+    # lower-bound sample so the learned percentile doesn't drift down
+    except asyncio.TimeoutError:
+        record_event(key, "timeouts", time.perf_counter() - start)
+        raise
+    except Exception:
+        record_event(key, "errors")
+        raise
+
+    record_event(key, "successes", time.perf_counter() - start)
+    return response
+
+
+async def _race_providers(pool, messages, params, hedge, percentile, timeout):
+    queue = list(pool)
+    pending = {}
+    errors = []
+    failures = []
+
+    def launch(hedged=False):
+        provider = queue.pop(0)
+        key = provider_key(provider)
+        task = asyncio.create_task(_call_provider(provider, messages, params, timeout))
+        # deadline: when this attempt earns a backup; None once it has one
+        started = time.monotonic()
+        deadline = started + hedge_delay(key, percentile) if hedge else None
+        pending[task] = {
+            "key": key, "hedged": hedged, "started": started,
+            "deadline": deadline, "overdue": False
+        }
+        if hedged:
+            record_event(key, "hedges_fired")
+
+    try:
+        launch()
+
+        while pending:
+            deadlines = [a["deadline"] for a in pending.values() if a["deadline"] is not None]
+            delay = max(0, min(deadlines) - time.monotonic()) if queue and deadlines else None
+            done, _ = await asyncio.wait(
+                pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            if not done:
+                # An in-flight attempt passed its latency percentile: fire a backup
+                overdue = min(
+                    (a for a in pending.values() if a["deadline"] is not None),
+                    key=lambda a: a["deadline"]
+                )
+                overdue["deadline"] = None
+                overdue["overdue"] = True
+                launch(hedged=True)
+                continue
+
+            winner = None
+            for task in done:
+                attempt = pending.pop(task)
+                try:
+                    response = task.result()
+                except Exception as e:
+                    errors.append(f"{attempt['key']}: {type(e).__name__}: {e}")
+                    failures.append(e)
+                    continue
+                if winner is None:
+                    winner = (response, attempt)
+
+            if winner:
+                response, attempt = winner
+                if attempt["hedged"]:
+                    record_event(attempt["key"], "hedges_won")
+                return response
+
+            # Failover: go to the next provider unless an in-flight attempt
+            # is still inside its hedge window
+            if queue and all(a["deadline"] is None for a in pending.values()):
+                launch(hedged=bool(pending))
+
+        # A lone provider surfaces its own error, as a plain client call would
+        if len(failures) == 1:
+            raise failures[0]
+        raise RuntimeError("All LLM providers failed: " + "; ".join(errors))
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        # Only an attempt already past its hedge deadline gives a fair
+        # lower-bound sample; a backup cancelled moments after launch doesn't
+        for attempt in pending.values():
+            elapsed = time.monotonic() - attempt["started"] if attempt["overdue"] else None
+            record_event(attempt["key"], "cancelled", elapsed)
+
+
+def _run_sync(coro):
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    # Called synchronously from inside an event loop (e.g. a sync handler
+    # on the runtime's loop): asyncio.run can't nest, so use a worker thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+# ==============================
+# ENTRY POINT
+# ==============================
+
+def chat_completion(messages, config=None, **params):
+    """
+    Run a chat completion against the request's provider pool.
+
+    Every attempt, pooled or not, is bounded by `request_timeout` and uses
+    LLM_MAX_RETRIES SDK retries. With fallbacks, errors and timeouts fail
+    over to the next provider, and `hedge_requests` fires a backup once the
+    in-flight provider passes its recent latency percentile; the first good
+    response wins.
+    """
+    config = config or {}
+
+    return _run_sync(_race_providers(
+        build_provider_pool(config),
+        messages,
+        params,
+        hedge=bool(config.get("hedge_requests")),
+        percentile=config.get("hedge_percentile"),
+        timeout=(
+            config["request_timeout"] if config.get("request_timeout") is not None
+            else LLM_REQUEST_TIMEOUT
+        )
+    ))
@@ -1,6 +1,6 @@
 import json
 import re
-from deviation_service import get_client, get_model_name
+from provider_service import chat_completion
 
 
 def clean_llm_json(raw_output: str):
@@ -65,15 +65,12 @@ Deviation Metrics:
 {json.dumps(metrics_json, indent=2)}
 """
 
-    client = get_client(config)
-    model = get_model_name(config)
-
-    response = client.chat.completions.create(
-        model=model,
+    response = chat_completion(
         messages=[
             {"role": "system", "content": system_instruction},
             {"role": "user", "content": user_input}
         ],
+        config=config,
         temperature=0.1
     )
 
@@ -1,4 +1,4 @@
-from deviation_service import get_client, get_model_name
+from provider_service import chat_completion
 
 def build_conversation_text(chat: dict) -> str:
     text = ""
@@ -19,15 +19,12 @@ Rules:
 - Concise: Maximum 300 words.
 - Format: "User wanted X. Model provided Y. User corrected with Z..."
 """
-    client = get_client(config)
-    model = get_model_name(config)
-
-    response = client.chat.completions.create(
-        model=model,
+    response = chat_completion(
         messages=[
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": conversation_text}
         ],
+        config=config,
         temperature=0.1
     )
 
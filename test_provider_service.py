@@ -0,0 +1,211 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import provider_service as ps
+
+
+PRIMARY = {"llm_type": "nvidia", "base_url": "http://primary/v1", "model_name": "m"}
+BACKUP = {"llm_type": "openai", "base_url": "http://backup/v1", "model_name": "m", "api_key": "k"}
+LOCAL = {"llm_type": "ollama", "base_url": "http://local/v1", "model_name": "m"}
+
+
+@pytest.fixture(autouse=True)
+def fake_providers(monkeypatch):
+    """
+    Stub AsyncOpenAI; behaviour maps base_url -> (seconds, result or exception)
+    and collects each client's max_retries.
+    """
+    behaviour = {}
+    behaviour["max_retries"] = []
+
+    class FakeAsyncOpenAI:
+        def __init__(self, api_key, base_url, max_retries):
+            self.base_url = base_url
+            behaviour["max_retries"].append(max_retries)
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def create(self, model, messages, **params):
+            delay, result = behaviour[self.base_url]
+            await asyncio.sleep(delay)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+    monkeypatch.setattr(ps, "AsyncOpenAI", FakeAsyncOpenAI)
+    monkeypatch.setattr(ps, "HEDGE_DEFAULT_DELAY", 0.2)
+    monkeypatch.setattr(ps, "HEDGE_MIN_SAMPLES", 5)
+    ps._provider_stats.clear()
+    yield behaviour
+    ps._provider_stats.clear()
+
+
+def run(pool_config):
+    return ps.chat_completion([{"role": "user", "content": "hi"}], config=pool_config)
+
+
+def test_failover_on_error(fake_providers):
+    fake_providers.update({
+        "http://primary/v1": (0.01, ValueError("down")),
+        "http://backup/v1": (0.01, "backup"),
+    })
+    assert run(dict(PRIMARY, fallback_providers=[BACKUP])) == "backup"
+    assert ps.get_provider_stats()[ps.provider_key(PRIMARY)]["errors"] == 1
+
+
+def test_failover_on_timeout(fake_providers):
+    fake_providers.update({
+        "http://primary/v1": (1, "primary"),
+        "http://backup/v1": (0.01, "backup"),
+    })
+    assert run(dict(PRIMARY, fallback_providers=[BACKUP], request_timeout=0.05)) == "backup"
+
+    stats = ps.get_provider_stats()[ps.provider_key(PRIMARY)]
+    assert stats["timeouts"] == 1
+    # Timed-out calls still count towards the latency window
+    assert stats["samples"] == 1
+
+
+def test_hedge_wins_and_loser_is_cancelled(fake_providers):
+    fake_providers.update({
+        "http://primary/v1": (5, "primary"),
+        "http://backup/v1": (0.01, "backup"),
+    })
+    assert run(dict(PRIMARY, fallback_providers=[BACKUP], hedge_requests=True)) == "backup"
+
+    stats = ps.get_provider_stats()
+    assert stats[ps.provider_key(PRIMARY)]["cancelled"] == 1
+    assert stats[ps.provider_key(PRIMARY)]["samples"] == 1
+    assert stats[ps.provider_key(BACKUP)]["hedges_fired"] == 1
+    assert stats[ps.provider_key(BACKUP)]["hedges_won"] == 1
+
+
+def test_losing_backup_adds_no_latency_samples(fake_providers, monkeypatch):
+    monkeypatch.setattr(ps, "HEDGE_DEFAULT_DELAY", 0.05)
+    fake_providers.update({
+        "http://primary/v1": (0.25, "primary"),
+        "http://backup/v1": (2.0, "backup"),
+    })
+    for _ in range(3):
+        assert run(dict(PRIMARY, fallback_providers=[BACKUP], hedge_requests=True)) == "primary"
+
+    stats = ps.get_provider_stats()[ps.provider_key(BACKUP)]
+    assert stats["hedges_fired"] == 3
+    assert stats["cancelled"] == 3
+    assert stats["samples"] == 0
+    assert stats["hedge_delay_seconds"] == ps.HEDGE_DEFAULT_DELAY
+
+
+def test_no_hedge_waits_for_primary(fake_providers):
+    fake_providers.update({
+        "http://primary/v1": (0.3, "primary"),
+        "http://backup/v1": (0.01, "backup"),
+    })
+    assert run(dict(PRIMARY, fallback_providers=[BACKUP])) == "primary"
+    assert ps.provider_key(BACKUP) not in ps.get_provider_stats()
+
+
+def test_failed_backup_moves_on_without_restarting_hedge_timer(fake_providers):
+    fake_providers.update({
+        "http://primary/v1": (2, "primary"),
+        "http://backup/v1": (0.01, ValueError("down")),
+        "http://local/v1": (0.01, "local"),
+    })
+    # The backup has learned a 10s hedge delay; waiting it out would let the
+    # 2s primary win instead of moving straight on to the local provider
+    for _ in range(ps.HEDGE_MIN_SAMPLES):
+        ps.record_event(ps.provider_key(BACKUP), "successes", 10)
+
+    result = run(dict(PRIMARY, fallback_providers=[BACKUP, LOCAL], hedge_requests=True))
+
+    assert result == "local"
+    stats = ps.get_provider_stats()
+    assert stats[ps.provider_key(BACKUP)]["errors"] == 1
+    assert stats[ps.provider_key(LOCAL)]["hedges_won"] == 1
+    assert stats[ps.provider_key(PRIMARY)]["cancelled"] == 1
+
+
+def test_all_providers_fail(fake_providers):
+    fake_providers.update({
+        "http://primary/v1": (0.01, ValueError("primary down")),
+        "http://backup/v1": (0.01, ValueError("backup down")),
+    })
+    with pytest.raises(RuntimeError) as exc:
+        run(dict(PRIMARY, fallback_providers=[BACKUP], hedge_requests=True))
+
+    assert "primary down" in str(exc.value)
+    assert "backup down" in str(exc.value)
+
+
+def test_hedge_delay_learns_percentile():
+    key = ps.provider_key(PRIMARY)
+    assert ps.hedge_delay(key) == ps.HEDGE_DEFAULT_DELAY
+
+    for latency in range(1, 101):
+        ps.record_event(key, "successes", latency / 100)
+
+    assert ps.hedge_delay(key, 95) == pytest.approx(0.95)
+    assert ps.hedge_delay(key, 50) == pytest.approx(0.50)
+
+
+def test_stats_are_capped_and_hide_base_urls(monkeypatch):
+    monkeypatch.setattr(ps, "MAX_TRACKED_PROVIDERS", 2)
+    for provider in (PRIMARY, BACKUP, LOCAL):
+        ps.record_event(ps.provider_key(provider), "successes", 0.1)
+
+    stats = ps.get_provider_stats()
+    assert list(stats) == [ps.provider_key(BACKUP), ps.provider_key(LOCAL)]
+    assert not any("http" in key for key in stats)
+
+
+def test_env_key_only_sent_to_own_endpoint(monkeypatch):
+    monkeypatch.setattr(ps, "NVIDIA_API_KEY", "server-key")
+
+    assert ps.resolve_endpoint({"llm_type": "nvidia"})[0] == "server-key"
+    assert ps.resolve_endpoint({"llm_type": "openai"})[0] == "dummy"
+    assert ps.resolve_endpoint({"base_url": "http://elsewhere/v1"})[0] == "dummy"
+
+
+def test_pool_can_be_called_from_a_running_loop(fake_providers):
+    fake_providers.update({
+        "http://primary/v1": (0.01, ValueError("down")),
+        "http://backup/v1": (0.01, "backup"),
+    })
+
+    async def sync_handler_on_loop():
+        return run(dict(PRIMARY, fallback_providers=[BACKUP]))
+
+    assert asyncio.run(sync_handler_on_loop()) == "backup"
+
+
+def test_single_provider_uses_request_timeout(fake_providers):
+    fake_providers["http://primary/v1"] = (1, "primary")
+
+    with pytest.raises(asyncio.TimeoutError):
+        run(dict(PRIMARY, request_timeout=0.05))
+    assert ps.get_provider_stats()[ps.provider_key(PRIMARY)]["timeouts"] == 1
+
+
+def test_single_provider_surfaces_its_own_error(fake_providers):
+    fake_providers["http://primary/v1"] = (0.01, ValueError("down"))
+
+    with pytest.raises(ValueError, match="down"):
+        run(PRIMARY)
+
+
+def test_retries_match_for_single_and_pooled_calls(fake_providers):
+    fake_providers.update({
+        "http://primary/v1": (0.01, ValueError("down")),
+        "http://backup/v1": (0.01, "backup"),
+    })
+    run(dict(PRIMARY, fallback_providers=[BACKUP]))
+    run(BACKUP)
+
+    assert fake_providers["max_retries"] == [ps.LLM_MAX_RETRIES] * 3